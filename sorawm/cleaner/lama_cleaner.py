@@ -11,6 +11,8 @@ from sorawm.iopaint.download import cli_download_model, scan_models
 from sorawm.iopaint.model_manager import ModelManager
 from sorawm.iopaint.schema import InpaintRequest
 from sorawm.utils.devices_utils import get_device
+from sorawm.utils.torch_utils import (capture_cuda_graphs,
+                                     compile_inpaint_model, use_channels_last)
 
 # This codebase is from https://github.com/Sanster/IOPaint#, thanks for their amazing work!
 
@@ -29,6 +31,15 @@ class LamaCleaner:
         self.model_manager = ModelManager(name=self.model, device=self.device)
         self.inpaint_request = InpaintRequest()
 
+    def compile_model(self) -> bool:
+        return compile_inpaint_model(self.model_manager.model)
+
+    def enable_cuda_graph(self) -> bool:
+        return capture_cuda_graphs(self.model_manager.model)
+
+    def enable_channels_last(self) -> bool:
+        return use_channels_last(self.model_manager.model)
+
     def clean(self, input_image: np.array, watermark_mask: np.array) -> np.array:
         inpaint_result = self.model_manager(
             input_image, watermark_mask, self.inpaint_request
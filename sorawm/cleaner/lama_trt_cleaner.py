@@ -0,0 +1,123 @@
+from pathlib import Path
+
+import torch
+from loguru import logger
+
+from sorawm.cleaner.lama_cleaner import LamaCleaner
+from sorawm.configs import LAMA_TRT_ENGINE_PATH
+
+# Opt-in TensorRT backend for LAMA on NVIDIA GPUs.
+# Build the engine once from an ONNX export of big-lama, e.g.:
+#   trtexec --onnx=lama.onnx --bf16 --saveEngine=resources/checkpoint/lama_bf16.plan \
+#       --minShapes=image:1x3x256x256,mask:1x1x256x256 \
+#       --maxShapes=image:1x3x2048x2048,mask:1x1x2048x2048
+
+
+class TensorRTModule:
+    """Callable wrapper running a serialized TensorRT engine on torch CUDA tensors.
+
+    Inputs are bound by name (LaMa's image and mask). Calls whose shapes fall
+    outside the engine's optimization profile are routed to fallback, the
+    original PyTorch network, instead of reading an unset output buffer.
+    """
+
+    input_names = ("image", "mask")
+
+    def __init__(self, engine_path: Path, device: torch.device, fallback=None):
+        import tensorrt as trt
+
+        self.device = device
+        self.fallback = fallback
+        runtime = trt.Runtime(trt.Logger(trt.Logger.WARNING))
+        self.engine = runtime.deserialize_cuda_engine(engine_path.read_bytes())
+        if self.engine is None:
+            # Engines only load on the TensorRT version and GPU they were built for.
+            raise RuntimeError(f"Failed to deserialize TensorRT engine {engine_path}")
+        self.context = self.engine.create_execution_context()
+
+        names = [
+            self.engine.get_tensor_name(i) for i in range(self.engine.num_io_tensors)
+        ]
+        engine_inputs = {
+            name
+            for name in names
+            if self.engine.get_tensor_mode(name) == trt.TensorIOMode.INPUT
+        }
+        if engine_inputs != set(self.input_names):
+            raise RuntimeError(
+                f"TensorRT engine {engine_path} has inputs {sorted(engine_inputs)}, "
+                f"expected {list(self.input_names)}"
+            )
+        self.output_name = next(
+            name
+            for name in names
+            if self.engine.get_tensor_mode(name) == trt.TensorIOMode.OUTPUT
+        )
+
+    def __call__(self, image: torch.Tensor, mask: torch.Tensor) -> torch.Tensor:
+        inputs = {
+            "image": image.to(self.device, torch.float32).contiguous(),
+            "mask": mask.to(self.device, torch.float32).contiguous(),
+        }
+        for name, tensor in inputs.items():
+            if not self.context.set_input_shape(name, tuple(tensor.shape)):
+                if self.fallback is None:
+                    raise RuntimeError(
+                        f"Shape {tuple(tensor.shape)} of {name} is outside the "
+                        "TensorRT engine profile"
+                    )
+                logger.debug(
+                    f"Shape {tuple(tensor.shape)} outside the TensorRT profile, "
+                    "running PyTorch LAMA"
+                )
+                return self.fallback(image, mask)
+            self.context.set_tensor_address(name, tensor.data_ptr())
+
+        output = torch.empty(
+            tuple(self.context.get_tensor_shape(self.output_name)),
+            dtype=torch.float32,
+            device=self.device,
+        )
+        self.context.set_tensor_address(self.output_name, output.data_ptr())
+        if not self.context.execute_async_v3(
+            torch.cuda.current_stream(self.device).cuda_stream
+        ):
+            raise RuntimeError("TensorRT LAMA inference failed")
+        return output
+
+
+class LamaTRTCleaner(LamaCleaner):
+    """LAMA with its network swapped for a TensorRT engine.
+
+    Pre/post-processing (crop strategy, padding) stays in iopaint's LaMa model.
+    Falls back to the PyTorch model when TensorRT, CUDA or the engine file is missing.
+    """
+
+    def __init__(self, engine_path: Path = LAMA_TRT_ENGINE_PATH):
+        super().__init__()
+        if self.device.type != "cuda" or not engine_path.exists():
+            logger.warning(
+                f"TensorRT engine {engine_path} unavailable, using PyTorch LAMA"
+            )
+            return
+        try:
+            self.model_manager.model.model = TensorRTModule(
+                engine_path, self.device, fallback=self.model_manager.model.model
+            )
+        except ImportError:
+            logger.warning("tensorrt is not installed, using PyTorch LAMA")
+            return
+        except RuntimeError as e:
+            logger.warning(f"{e}, using PyTorch LAMA")
+            return
+        logger.info(f"Loaded TensorRT LAMA engine: {engine_path}")
+
+    def compile_model(self) -> bool:
+        if isinstance(self.model_manager.model.model, TensorRTModule):
+            return False
+        return super().compile_model()
+
+    def enable_cuda_graph(self) -> bool:
+        if isinstance(self.model_manager.model.model, TensorRTModule):
+            return False
+        return super().enable_cuda_graph()
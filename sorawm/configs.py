@@ -17,6 +17,8 @@ SPYNET_CHECKPOINT_PATH = CHECKPOINT_DIR / "spynet_20210409-c6c1bd09.pth"
 # release_model/E2FGVI-HQ-CVPR22.pth
 E2FGVI_HQ_CHECKPOINT_PATH = CHECKPOINT_DIR / "E2FGVI-HQ-CVPR22.pth"
 E2FGVI_HQ_CHECKPOINT_REMOTE_URL = "https://github.com/linkedlist771/SoraWatermarkCleaner/releases/download/V0.0.1/E2FGVI-HQ-CVPR22.pth"
+# Pre-built TensorRT engine for CleanerType.LAMA_TRT, see cleaner/lama_trt_cleaner.py
+LAMA_TRT_ENGINE_PATH = CHECKPOINT_DIR / "lama_bf16.plan"
 
 
 OUTPUT_DIR = ROOT / "output"
@@ -26,6 +28,9 @@ OUTPUT_DIR.mkdir(exist_ok=True, parents=True)
 
 DEFAULT_WATERMARK_REMOVE_MODEL = "lama"
 
+# Kept here rather than in sorawm.core so UIs can filter files without importing torch
+IMAGE_EXTENSIONS = [".jpg", ".jpeg", ".png", ".webp", ".bmp", ".tiff", ".tif"]
+
 WORKING_DIR = ROOT / "working_dir"
 WORKING_DIR.mkdir(exist_ok=True, parents=True)
 
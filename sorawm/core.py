@@ -1,21 +1,287 @@
+import gc
+import shutil
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Callable
 
+import cv2
 import numpy as np
+import torch
 from loguru import logger
 
+from sorawm.configs import IMAGE_EXTENSIONS
 from sorawm.schemas import CleanerType
+from sorawm.utils.devices_utils import (configure_cuda_backends, get_device,
+                                        inference_autocast)
+from sorawm.utils.mask_utils import (DILATE_SPANS, fill_dilated_boxes,
+                                     normalize_bboxes)
 from sorawm.watermark_cleaner import WaterMarkCleaner
 from sorawm.watermark_detector import SoraWaterMarkDetector
 
-IMAGE_EXTENSIONS = [".jpg", ".jpeg", ".png", ".webp", ".bmp", ".tiff", ".tif"]
+# Images detected in one YOLO forward (and decoded one batch ahead) in run_images
+IMAGE_BATCH_SIZE = 4
+
+
+def read_image(input_image_path: Path) -> np.ndarray:
+    image = cv2.imread(str(input_image_path))
+    if image is None:
+        raise ValueError(f"Failed to read image: {input_image_path}")
+    return image
+
+
+def write_image(
+    output_image_path: Path,
+    image: np.ndarray,
+    quiet: bool = False,
+    source_path: Path | None = None,
+):
+    """Save image; pass source_path when image is the unmodified decode of that file."""
+    if (
+        source_path is not None
+        and source_path.suffix.lower() == output_image_path.suffix.lower()
+    ):
+        # Nothing was cleaned: keep the original bytes instead of re-encoding
+        if source_path.resolve() != output_image_path.resolve():
+            shutil.copyfile(source_path, output_image_path)
+    else:
+        cv2.imwrite(str(output_image_path), image)
+
+    if not quiet:
+        file_size = output_image_path.stat().st_size
+        logger.info(f"✓ Successfully saved image at: {output_image_path}")
+        logger.info(f"✓ File size: {file_size / 1024:.2f} KB")
 
 
 class SoraWM:
-    def __init__(self, cleaner_type: CleanerType = CleanerType.LAMA):
+    def __init__(
+        self,
+        cleaner_type: CleanerType = CleanerType.LAMA,
+        use_fp16: bool = False,
+        compile_cleaner: bool = False,
+        use_cuda_graph: bool = False,
+        roi_only: bool = True,
+        channels_last: bool = False,
+        cuda_backends: bool = True,
+    ):
+        if cuda_backends and get_device().type == "cuda":
+            configure_cuda_backends()
         self.detector = SoraWaterMarkDetector()
         self.cleaner = WaterMarkCleaner(cleaner_type)
         self.cleaner_type = cleaner_type
+        # Opt-in and LaMa only. MAT is already built in float16 on CUDA, and
+        # autocasting it (to bf16 on Ampere+) would mix dtypes inside its conv
+        # layers. LaMa is TorchScript with FFT blocks that cuFFT cannot run in
+        # bf16 (or fp16 at non power-of-two crop sizes), so verify on the
+        # target GPU before turning this on.
+        self.use_fp16 = use_fp16 and cleaner_type in [
+            CleanerType.LAMA,
+            CleanerType.LAMA_TRT,
+        ]
+        self.roi_only = roi_only
+        self._mask_buf = None
+        self._mask_key = None
+        self.dilate_spans = [(0, 0, 0)]
+        if cleaner_type in [CleanerType.LAMA, CleanerType.MAT, CleanerType.LAMA_TRT]:
+            self.dilate_spans = DILATE_SPANS
+        if roi_only:
+            # iopaint's CROP strategy inpaints only the mask boxes plus a margin,
+            # but by default only kicks in for frames larger than 800px.
+            self.cleaner.inpaint_request.hd_strategy_crop_trigger_size = 0
+        if channels_last:
+            self.cleaner.enable_channels_last()
+        # torch.compile(mode="reduce-overhead") already captures CUDA graphs, so
+        # only fall through to our own capture when compilation was skipped
+        # (e.g. LaMa is TorchScript) or not requested.
+        compiled = compile_cleaner and self.cleaner.compile_model()
+        if use_cuda_graph and not compiled:
+            self.cleaner.enable_cuda_graph()
+
+    def close(self):
+        """Release the detector and cleaner and return their cached GPU memory.
+
+        Call before constructing a SoraWM with another cleaner type on small GPUs.
+        """
+        self.detector = None
+        self.cleaner = None
+        self._mask_buf = None
+        self._mask_key = None
+        # Collect first so the dropped tensors are actually freed before the
+        # allocator hands its cached blocks back to the driver.
+        gc.collect()
+        if torch.cuda.is_available():
+            torch.cuda.empty_cache()
+
+    def warmup(
+        self,
+        height: int,
+        width: int,
+        bbox: tuple[int, int, int, int] | list[tuple[int, int, int, int]] | None = None,
+    ):
+        """Run one dummy clean_image on a blank image with a representative bbox.
+
+        With roi_only the cleaner sees a window around the bbox rather than the
+        whole frame, so pass a bbox of the size real watermarks have (defaults
+        to the top-left eighth of the frame). Moves cuDNN autotuning, allocator
+        growth and (optional) compilation for that shape out of the first real
+        request.
+        """
+        if bbox is None:
+            bbox = (0, 0, width // 8, height // 8)
+        image = np.zeros((height, width, 3), dtype=np.uint8)
+        self.clean_image(image, bbox)
+
+    def clean_image(
+        self,
+        image: np.ndarray,
+        bbox: tuple[int, int, int, int] | list[tuple[int, int, int, int]],
+    ) -> np.ndarray:
+        """Inpaint the bbox region(s) of a BGR image and return the cleaned image."""
+        height, width = image.shape[:2]
+
+        # Handle single or multiple bboxes
+        boxes = normalize_bboxes(bbox, width, height)
+        boxes = boxes[(boxes[:, 0] < boxes[:, 2]) & (boxes[:, 1] < boxes[:, 3])]
+        if not len(boxes):
+            return image.copy()
+
+        # Create mask. Consecutive frames with the same size and boxes (e.g. a
+        # manual bbox over a batch) reuse the previous mask untouched; other
+        # frames of the same size refill the previous buffer.
+        mask_key = (height, width, boxes.tobytes())
+        if self._mask_key != mask_key:
+            if self._mask_buf is None or self._mask_buf.shape != (height, width):
+                self._mask_buf = np.zeros((height, width), dtype=np.uint8)
+            else:
+                self._mask_buf.fill(0)
+
+            # Fill the boxes already dilated by the elliptical kernel for better
+            # results
+            fill_dilated_boxes(self._mask_buf, boxes, self.dilate_spans)
+            self._mask_key = mask_key
+        mask = self._mask_buf
+
+        r = max(dy for dy, _, _ in self.dilate_spans)
+        x1, y1 = np.maximum(boxes[:, :2].min(axis=0) - r, 0)
+        x2, y2 = np.minimum(boxes[:, 2:].max(axis=0) + r, (width, height))
+
+        if not self.roi_only:
+            with inference_autocast(get_device(), self.use_fp16):
+                return self.cleaner.clean(image, mask)
+
+        # The CROP strategy never reads further than two crop margins from the
+        # mask (one margin, plus one more when a crop is pushed off an edge)
+        # and copies everything else through, so cleaning just that window and
+        # pasting it back is identical and skips the full-frame copies.
+        margin = 2 * self.cleaner.inpaint_request.hd_strategy_crop_margin
+        x1, y1 = np.maximum((x1 - margin, y1 - margin), 0)
+        x2, y2 = np.minimum((x2 + margin, y2 + margin), (width, height))
+        with inference_autocast(get_device(), self.use_fp16):
+            cleaned_patch = self.cleaner.clean(
+                image[y1:y2, x1:x2], mask[y1:y2, x1:x2]
+            )
+        cleaned_image = image.copy()
+        cleaned_image[y1:y2, x1:x2] = cleaned_patch
+        return cleaned_image
+
+    def run_images(
+        self,
+        input_image_paths: list[Path],
+        output_dir: Path,
+        progress_callback: Callable[[int], None] | None = None,
+        quiet: bool = False,
+        manual_bbox: tuple[int, int, int, int] | list[tuple[int, int, int, int]] | None = None,
+    ) -> list[Path]:
+        """Process a list of images with the already loaded models
+
+        Args:
+            input_image_paths: Paths to input images
+            output_dir: Directory to save processed images, named after the inputs
+            progress_callback: Optional callback for overall progress updates (0-100)
+            quiet: If True, suppress log output
+            manual_bbox: Optional manual bounding box(es) applied to every image
+
+        Returns:
+            Paths of the saved images
+
+        Raises:
+            ValueError: If two inputs share a file name (their outputs would collide)
+        """
+        # Outputs are named after the inputs, so equal names from different
+        # folders would overwrite each other (concurrently, on the writer pool).
+        duplicates = sorted(
+            name
+            for name, count in Counter(p.name for p in input_image_paths).items()
+            if count > 1
+        )
+        if duplicates:
+            raise ValueError(f"Duplicate input file names: {duplicates}")
+
+        output_dir.mkdir(parents=True, exist_ok=True)
+        output_image_paths = []
+        total = len(input_image_paths)
+        written = 0
+
+        def wait_for_writes(writes):
+            # Progress counts saved images, so it reaches 100 only once the
+            # last write has finished.
+            nonlocal written
+            for future in writes:
+                future.result()
+                written += 1
+                if progress_callback:
+                    progress_callback(int(written * 100 / total))
+
+        batches = [
+            input_image_paths[i : i + IMAGE_BATCH_SIZE]
+            for i in range(0, total, IMAGE_BATCH_SIZE)
+        ]
+        # cv2.imread/imwrite release the GIL, so decoding the next batch and
+        # encoding the previous one overlap with cleaning the current one.
+        with (
+            ThreadPoolExecutor(max_workers=IMAGE_BATCH_SIZE) as reader,
+            ThreadPoolExecutor(max_workers=IMAGE_BATCH_SIZE) as writer,
+        ):
+            pending = [
+                reader.submit(read_image, path) for path in (batches[0] if batches else [])
+            ]
+            writes = []
+            for batch_idx, batch in enumerate(batches):
+                images = [future.result() for future in pending]
+                if batch_idx + 1 < len(batches):
+                    pending = [
+                        reader.submit(read_image, path)
+                        for path in batches[batch_idx + 1]
+                    ]
+                if manual_bbox is None:
+                    detections = self.detector.detect_batch(images)
+                else:
+                    detections = [None] * len(images)
+                # Keep at most one batch of cleaned images waiting to be written
+                wait_for_writes(writes)
+                writes = []
+                for input_image_path, image, detection_result in zip(
+                    batch, images, detections
+                ):
+                    output_image_path = output_dir / input_image_path.name
+                    cleaned_image = self._process_image(
+                        image,
+                        quiet=quiet,
+                        manual_bbox=manual_bbox,
+                        detection_result=detection_result,
+                    )
+                    writes.append(
+                        writer.submit(
+                            write_image,
+                            output_image_path,
+                            cleaned_image,
+                            quiet,
+                            input_image_path if cleaned_image is image else None,
+                        )
+                    )
+                    output_image_paths.append(output_image_path)
+            wait_for_writes(writes)
+        return output_image_paths
 
     def run_image(
         self,
@@ -34,22 +300,40 @@ class SoraWM:
             quiet: If True, suppress log output
             manual_bbox: Optional manual bounding box(es) for watermark location
         """
-        import cv2
-
         output_image_path.parent.mkdir(parents=True, exist_ok=True)
 
         # Read image
         if progress_callback:
             progress_callback(10)
 
-        image = cv2.imread(str(input_image_path))
-        if image is None:
-            raise ValueError(f"Failed to read image: {input_image_path}")
+        image = read_image(input_image_path)
+        cleaned_image = self._process_image(
+            image, progress_callback, quiet, manual_bbox
+        )
+
+        # Save image
+        write_image(
+            output_image_path,
+            cleaned_image,
+            quiet,
+            input_image_path if cleaned_image is image else None,
+        )
+
+        if progress_callback:
+            progress_callback(100)
 
+    def _process_image(
+        self,
+        image: np.ndarray,
+        progress_callback: Callable[[int], None] | None = None,
+        quiet: bool = False,
+        manual_bbox: tuple[int, int, int, int] | list[tuple[int, int, int, int]] | None = None,
+        detection_result: dict | None = None,
+    ) -> np.ndarray:
         height, width = image.shape[:2]
 
         if not quiet:
-            logger.debug(f"Image size: width={width}, height={height}")
+            logger.debug("Image size: width={}, height={}", width, height)
 
         # Detect or use manual bbox
         if manual_bbox is not None:
@@ -68,7 +352,8 @@ class SoraWM:
             if progress_callback:
                 progress_callback(20)
 
-            detection_result = self.detector.detect(image)
+            if detection_result is None:
+                detection_result = self.detector.detect(image)
             if detection_result["detected"]:
                 bbox = detection_result["bbox"]
                 if not quiet:
@@ -83,26 +368,6 @@ class SoraWM:
 
         # Clean image
         if bbox is not None:
-            if progress_callback:
-                progress_callback(50)
-
-            # Create mask
-            mask = np.zeros((height, width), dtype=np.uint8)
-
-            # Handle multiple bboxes
-            if isinstance(bbox, list):
-                for x1, y1, x2, y2 in bbox:
-                    mask[y1:y2, x1:x2] = 255
-            else:
-                x1, y1, x2, y2 = bbox
-                mask[y1:y2, x1:x2] = 255
-
-            # Dilate mask for better results
-            if self.cleaner_type in [CleanerType.LAMA, CleanerType.MAT]:
-                kernel_size = 17
-                kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (kernel_size, kernel_size))
-                mask = cv2.dilate(mask, kernel, iterations=1)
-
             if progress_callback:
                 progress_callback(60)
 
@@ -110,7 +375,7 @@ class SoraWM:
             if not quiet:
                 logger.info(f"Cleaning image with {self.cleaner_type} model...")
 
-            cleaned_image = self.cleaner.clean(image, mask)
+            cleaned_image = self.clean_image(image, bbox)
 
             if progress_callback:
                 progress_callback(90)
@@ -120,16 +385,7 @@ class SoraWM:
             if progress_callback:
                 progress_callback(90)
 
-        # Save image
-        cv2.imwrite(str(output_image_path), cleaned_image)
-
-        if not quiet:
-            file_size = output_image_path.stat().st_size
-            logger.info(f"✓ Successfully saved image at: {output_image_path}")
-            logger.info(f"✓ File size: {file_size / 1024:.2f} KB")
-
-        if progress_callback:
-            progress_callback(100)
+        return cleaned_image
 
 
 if __name__ == "__main__":
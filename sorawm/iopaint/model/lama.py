@@ -1,11 +1,10 @@
 import os
 
-import cv2
 import numpy as np
 import torch
 
 from sorawm.iopaint.helper import (download_model, get_cache_path_by_url,
-                                   load_jit_model, norm_img)
+                                   load_jit_model)
 from sorawm.iopaint.schema import InpaintRequest
 
 from .base import InpaintModel
@@ -47,18 +46,23 @@ class LaMa(InpaintModel):
         mask: [H, W]
         return: BGR IMAGE
         """
-        image = norm_img(image)
-        mask = norm_img(mask)
-
-        mask = (mask > 0) * 1
-        image = torch.from_numpy(image).unsqueeze(0).to(self.device)
-        mask = torch.from_numpy(mask).unsqueeze(0).to(self.device)
+        # Ship uint8 CHW to the device and normalize there, 4x less host->device
+        # traffic than the float32 arrays built by norm_img.
+        if mask.ndim == 3:
+            mask = mask[:, :, 0]
+        image = torch.from_numpy(np.ascontiguousarray(image.transpose(2, 0, 1)))
+        mask = torch.from_numpy(np.ascontiguousarray(mask)).unsqueeze(0)
+        image = image.unsqueeze(0).to(self.device).float() / 255
+        mask = (mask.unsqueeze(0).to(self.device) > 0).float()
 
         inpainted_image = self.model(image, mask)
 
-        cur_res = inpainted_image[0].permute(1, 2, 0).detach().cpu().numpy()
-        cur_res = np.clip(cur_res * 255, 0, 255).astype("uint8")
-        cur_res = cv2.cvtColor(cur_res, cv2.COLOR_RGB2BGR)
+        # Quantize and swap RGB -> BGR on the device, then download uint8 (a
+        # quarter of the float32 bytes) with no further host-side passes.
+        cur_res = inpainted_image[0].detach().flip(0).permute(1, 2, 0).float()
+        cur_res = (
+            (cur_res * 255).clamp(0, 255).to(torch.uint8).contiguous().cpu().numpy()
+        )
         return cur_res
 
 
@@ -1,7 +1,6 @@
 import os
 import random
 
-import cv2
 import numpy as np
 import torch
 import torch.nn as nn
@@ -1928,6 +1927,6 @@ class MAT(InpaintModel):
             .clamp(0, 255)
             .to(torch.uint8)
         )
-        output = output[0].cpu().numpy()
-        cur_res = cv2.cvtColor(output, cv2.COLOR_RGB2BGR)
+        # RGB -> BGR on the device instead of a host-side cvtColor pass
+        cur_res = output[0].flip(-1).contiguous().cpu().numpy()
         return cur_res
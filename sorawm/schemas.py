@@ -4,3 +4,4 @@ from enum import StrEnum
 class CleanerType(StrEnum):
     LAMA = "lama"
     MAT = "mat"
+    LAMA_TRT = "lama_trt"
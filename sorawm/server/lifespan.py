@@ -8,6 +8,13 @@ from sorawm.server.db import init_db
 from sorawm.server.worker import worker
 
 
+def _log_worker_exit(task: asyncio.Task):
+    if task.cancelled():
+        return
+    if task.exception() is not None:
+        logger.opt(exception=task.exception()).error("Worker task crashed")
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     logger.info("Starting up...")
@@ -15,13 +22,16 @@ async def lifespan(app: FastAPI):
     await init_db()
     logger.info("Database initialized")
 
-    await worker.initialize()
-
-    _ = asyncio.create_task(worker.run())
+    # The worker loads the models in the background before draining the queue.
+    # Keep a reference so the task is not garbage collected, and log if it dies.
+    app.state.worker_task = asyncio.create_task(worker.run())
+    app.state.worker_task.add_done_callback(_log_worker_exit)
 
     logger.info("Application started successfully")
 
     yield
 
     logger.info("Shutting down...")
+    app.state.worker_task.cancel()
+    worker.executor.shutdown(wait=False, cancel_futures=True)
     logger.info("Application shutdown complete")
@@ -1,5 +1,8 @@
 import asyncio
+import contextlib
+import time
 from asyncio import Queue
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 from uuid import uuid4
@@ -7,26 +10,42 @@ from uuid import uuid4
 from loguru import logger
 from sqlalchemy import select
 
-from sorawm.configs import WORKING_DIR
-from sorawm.core import SoraWM
+from sorawm.configs import IMAGE_EXTENSIONS, WORKING_DIR
 from sorawm.server.db import get_session
 from sorawm.server.models import Task
 from sorawm.server.schemas import Status, WMRemoveResults
 
+# Progress callbacks can fire per frame; cap the updates at ~30 Hz.
+PROGRESS_MIN_INTERVAL = 1 / 30
+
 
 class WMRemoveTaskWorker:
     def __init__(self) -> None:
         self.queue = Queue()
         self.sora_wm = None
+        # One long-lived thread owns the models, so the CUDA context and the
+        # caching allocator stay warm across tasks.
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sorawm")
         self.output_dir = WORKING_DIR
         self.upload_dir = WORKING_DIR / "uploads"
         self.upload_dir.mkdir(exist_ok=True, parents=True)
 
     async def initialize(self):
         logger.info("Initializing SoraWM models...")
-        self.sora_wm = SoraWM()
+        # Load weights off the event loop so the app can accept uploads
+        # while the models are paged in.
+        loop = asyncio.get_running_loop()
+        self.sora_wm = await loop.run_in_executor(self.executor, self._load_sora_wm)
         logger.info("SoraWM models initialized")
 
+    @staticmethod
+    def _load_sora_wm():
+        # torch/iopaint are imported here, on the executor thread, so the
+        # server comes up without paying their import time.
+        from sorawm.core import SoraWM
+
+        return SoraWM()
+
     async def create_task(self) -> str:
         task_uuid = str(uuid4())
         async with get_session() as session:
@@ -61,12 +80,23 @@ class WMRemoveTaskWorker:
         logger.error(f"Task {task_id} marked as ERROR: {error_msg}")
 
     async def run(self):
+        if self.sora_wm is None:
+            try:
+                await self.initialize()
+            except Exception as e:
+                logger.exception("Failed to initialize SoraWM models")
+                await self._reject_tasks(f"Model initialization failed: {e}")
+                return
         logger.info("Worker started, waiting for tasks...")
         while True:
             task_uuid, video_path = await self.queue.get()
             logger.info(f"Processing task {task_uuid}: {video_path}")
 
             try:
+                # SoraWM only exposes the image pipeline in this tree.
+                if video_path.suffix.lower() not in IMAGE_EXTENSIONS:
+                    raise ValueError(f"Unsupported file type: {video_path.suffix}")
+
                 timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
                 file_suffix = video_path.suffix
                 output_filename = f"{task_uuid}_{timestamp}{file_suffix}"
@@ -81,15 +111,39 @@ class WMRemoveTaskWorker:
                     task.percentage = 10
 
                 loop = asyncio.get_event_loop()
+                progress_queue = Queue()
 
-                def progress_callback(percentage: int):
-                    asyncio.run_coroutine_threadsafe(
-                        self._update_progress(task_uuid, percentage), loop
-                    )
+                last_progress = -1
+                last_progress_ts = 0.0
 
-                await asyncio.to_thread(
-                    self.sora_wm.run, video_path, output_path, progress_callback
+                def progress_callback(percentage: int):
+                    nonlocal last_progress, last_progress_ts
+                    now = time.monotonic()
+                    if percentage == last_progress or (
+                        now - last_progress_ts < PROGRESS_MIN_INTERVAL
+                        and percentage != 100
+                    ):
+                        return
+                    last_progress, last_progress_ts = percentage, now
+                    loop.call_soon_threadsafe(progress_queue.put_nowait, percentage)
+
+                drain_task = asyncio.create_task(
+                    self._drain_progress(task_uuid, progress_queue)
                 )
+                try:
+                    await loop.run_in_executor(
+                        self.executor,
+                        self.sora_wm.run_image,
+                        video_path,
+                        output_path,
+                        progress_callback,
+                    )
+                finally:
+                    # Wait for the drain to stop so a late progress write cannot
+                    # land after the FINISHED update below.
+                    drain_task.cancel()
+                    with contextlib.suppress(asyncio.CancelledError):
+                        await drain_task
 
                 async with get_session() as session:
                     result = await session.execute(
@@ -118,6 +172,24 @@ class WMRemoveTaskWorker:
             finally:
                 self.queue.task_done()
 
+    async def _reject_tasks(self, error_msg: str):
+        # Without models nothing can be processed, so fail queued and future
+        # tasks instead of leaving them in PROCESSING forever.
+        while True:
+            task_uuid, _ = await self.queue.get()
+            try:
+                await self.mark_task_error(task_uuid, error_msg)
+            finally:
+                self.queue.task_done()
+
+    async def _drain_progress(self, task_id: str, progress_queue: Queue):
+        while True:
+            percentage = await progress_queue.get()
+            # Only the latest value matters, drop whatever piled up meanwhile.
+            while not progress_queue.empty():
+                percentage = progress_queue.get_nowait()
+            await self._update_progress(task_id, percentage)
+
     async def _update_progress(self, task_id: str, percentage: int):
         try:
             async with get_session() as session:
@@ -125,7 +197,9 @@ class WMRemoveTaskWorker:
                 task = result.scalar_one_or_none()
                 if task:
                     task.percentage = percentage
-                    logger.debug(f"Task {task_id} progress updated to {percentage}%")
+                    logger.debug(
+                        "Task {} progress updated to {}%", task_id, percentage
+                    )
         except Exception as e:
             logger.error(f"Error updating progress for task {task_id}: {e}")
 
@@ -1,3 +1,4 @@
+from contextlib import nullcontext
 from functools import lru_cache
 
 import torch
@@ -13,3 +14,30 @@ def get_device():
         device = "mps"
     logger.debug(f"Using device: {device}")
     return torch.device(device)
+
+
+def configure_cuda_backends():
+    """Allow TF32 tensor cores and cuDNN autotuning for the whole process.
+
+    These are global torch settings (the detector is affected too), so callers
+    opt in explicitly. cuDNN autotunes once per new input shape: ROI crops of
+    same-sized watermarks repeat across images, while a new crop size pays
+    one extra tuning pass.
+    """
+    torch.set_float32_matmul_precision("high")
+    torch.backends.cudnn.benchmark = True
+    torch.backends.cudnn.allow_tf32 = True
+
+
+def inference_autocast(device: torch.device, enabled: bool = True):
+    """Half-precision autocast for the cleaners' forward pass on CUDA.
+
+    Prefers bfloat16 when the GPU supports it, float16 otherwise. On other
+    devices, or when disabled, this is a no-op context. Eager autocast around
+    TorchScript modules is not officially supported by PyTorch, so callers
+    keep this opt-in.
+    """
+    if not enabled or device.type != "cuda":
+        return nullcontext()
+    dtype = torch.bfloat16 if torch.cuda.is_bf16_supported() else torch.float16
+    return torch.autocast(device_type="cuda", dtype=dtype)
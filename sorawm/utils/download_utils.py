@@ -30,14 +30,11 @@ def ensure_model_downloaded(model_path: Path, url: str, force_download: bool = F
                         if chunk:
                             f.write(chunk)
                             pbar.update(len(chunk))
-            if model_path.exists():
-                model_path.unlink()
-            temp_file.rename(model_path)
+            temp_file.replace(model_path)
             logger.success(f"✓ Model downloaded: {model_path}")
             return True
         except requests.exceptions.RequestException as e:
-            if temp_file.exists():
-                temp_file.unlink()
+            temp_file.unlink(missing_ok=True)
             raise RuntimeError(f"Download failed: {e}")
     else:
         logger.debug(f"Model already exists: {model_path}")
@@ -0,0 +1,122 @@
+import torch
+from loguru import logger
+
+
+def compile_inpaint_model(inpaint_model) -> bool:
+    """Wrap the network of an iopaint InpaintModel with torch.compile in place.
+
+    TorchScript models (e.g. LaMa) are already graph-compiled and are left as-is.
+    Returns True if the model was compiled.
+    """
+    model = inpaint_model.model
+    if isinstance(model, torch.jit.ScriptModule):
+        logger.debug(f"{inpaint_model.name} is a TorchScript model, skip torch.compile")
+        return False
+    # Crops vary from image to image, so each new padded shape recompiles (and
+    # captures its own CUDA graph); repeated watermark sizes reuse them.
+    inpaint_model.model = torch.compile(model, mode="reduce-overhead", dynamic=False)
+    logger.debug(f"{inpaint_model.name} wrapped with torch.compile")
+    return True
+
+
+def use_channels_last(inpaint_model) -> bool:
+    """Run the network of an iopaint InpaintModel in NHWC (channels_last) layout.
+
+    Converts the weights once and every 4D tensor input on each call, so cuDNN
+    can pick its tensor-core NHWC kernels without internal transposes.
+    """
+    model = inpaint_model.model
+    if inpaint_model.device.type != "cuda" or not isinstance(model, torch.nn.Module):
+        return False
+    if isinstance(model, torch.jit.ScriptModule):
+        # Wrapping would hide the ScriptModule from compile_inpaint_model's guard.
+        logger.debug(f"{inpaint_model.name} is a TorchScript model, skip channels_last")
+        return False
+    model = model.to(memory_format=torch.channels_last)
+
+    def forward(*args, **kwargs):
+        args = [
+            arg.contiguous(memory_format=torch.channels_last)
+            if isinstance(arg, torch.Tensor) and arg.dim() == 4
+            else arg
+            for arg in args
+        ]
+        return model(*args, **kwargs)
+
+    inpaint_model.model = forward
+    logger.debug(f"{inpaint_model.name} switched to channels_last")
+    return True
+
+
+class CUDAGraphModule:
+    """Replay a captured CUDA graph per distinct input shape instead of eager launches.
+
+    Only tensor positional arguments are treated as graph inputs; other
+    arguments and keyword arguments are baked into the graph at capture time.
+    Each graph pins its own static buffers, so once max_graphs shapes have been
+    captured, further unseen shapes run eagerly.
+    """
+
+    def __init__(self, module, warmup_iters: int = 3, max_graphs: int = 8):
+        self.module = module
+        self.warmup_iters = warmup_iters
+        self.max_graphs = max_graphs
+        self.graphs = {}
+
+    def __call__(self, *args, **kwargs):
+        key = tuple(
+            (tuple(arg.shape), arg.dtype) if isinstance(arg, torch.Tensor) else arg
+            for arg in args
+        ) + tuple(sorted(kwargs.items()))
+        if key not in self.graphs:
+            if len(self.graphs) >= self.max_graphs:
+                return self.module(*args, **kwargs)
+            self.graphs[key] = self._capture(args, kwargs)
+        graph, static_args, static_output = self.graphs[key]
+        for static_arg, arg in zip(static_args, args):
+            if isinstance(arg, torch.Tensor):
+                static_arg.copy_(arg)
+        graph.replay()
+        return static_output.clone()
+
+    def _capture(self, args, kwargs):
+        static_args = [
+            arg.clone() if isinstance(arg, torch.Tensor) else arg for arg in args
+        ]
+        # Keep the caller's autocast, but without its weight-cast cache: cached
+        # casts are freed when the caller's autocast exits, and a graph that
+        # read them would replay from freed memory. Uncached, the casts are
+        # recorded into the graph itself.
+        autocast_dtype = torch.get_autocast_dtype("cuda")
+        autocast_enabled = torch.is_autocast_enabled("cuda")
+
+        def autocast():
+            return torch.autocast(
+                device_type="cuda",
+                dtype=autocast_dtype,
+                enabled=autocast_enabled,
+                cache_enabled=False,
+            )
+
+        # Warm up on a side stream so lazy init/autotuning is not captured.
+        stream = torch.cuda.Stream()
+        stream.wait_stream(torch.cuda.current_stream())
+        with torch.cuda.stream(stream), autocast():
+            for _ in range(self.warmup_iters):
+                self.module(*static_args, **kwargs)
+        torch.cuda.current_stream().wait_stream(stream)
+
+        graph = torch.cuda.CUDAGraph()
+        with torch.cuda.graph(graph), autocast():
+            static_output = self.module(*static_args, **kwargs)
+        logger.debug(f"Captured CUDA graph #{len(self.graphs) + 1}")
+        return graph, static_args, static_output
+
+
+def capture_cuda_graphs(inpaint_model) -> bool:
+    """Wrap the network of an iopaint InpaintModel with CUDAGraphModule in place."""
+    if inpaint_model.device.type != "cuda":
+        return False
+    inpaint_model.model = CUDAGraphModule(inpaint_model.model)
+    logger.debug(f"{inpaint_model.name} will replay CUDA graphs")
+    return True
@@ -4,8 +4,6 @@ from typing import List
 
 import numpy as np
 
-from sorawm.cleaner.lama_cleaner import LamaCleaner
-from sorawm.cleaner.mat_cleaner import MATCleaner
 from sorawm.schemas import CleanerType
 
 
@@ -14,10 +12,19 @@ class WaterMarkCleaner:
 
     def __new__(cls, cleaner_type: CleanerType):
         """使用 __new__ 方法实现简单工厂模式"""
+        # Import lazily so only the selected backend's dependencies are loaded
         match cleaner_type:
             case CleanerType.LAMA:
+                from sorawm.cleaner.lama_cleaner import LamaCleaner
+
                 return LamaCleaner()
             case CleanerType.MAT:
+                from sorawm.cleaner.mat_cleaner import MATCleaner
+
                 return MATCleaner()
+            case CleanerType.LAMA_TRT:
+                from sorawm.cleaner.lama_trt_cleaner import LamaTRTCleaner
+
+                return LamaTRTCleaner()
             case _:
                 raise ValueError(f"Invalid cleaner type: {cleaner_type}")
@@ -7,7 +7,6 @@ from ultralytics import YOLO
 from sorawm.configs import WATER_MARK_DETECT_YOLO_WEIGHTS
 from sorawm.utils.devices_utils import get_device
 from sorawm.utils.download_utils import download_detector_weights
-from sorawm.utils.video_utils import VideoLoader
 
 # based on the sora tempalte to detect the whole, and then got the icon part area.
 
@@ -23,11 +22,18 @@ class SoraWaterMarkDetector:
         self.model.eval()
 
     def detect(self, input_image: np.array):
+        return self.detect_batch([input_image])[0]
+
+    def detect_batch(self, input_images: list[np.array]) -> list[dict]:
+        """Detect watermarks in several images with a single YOLO forward."""
+        if not input_images:
+            return []
         # Run YOLO inference
-        results = self.model(input_image, verbose=False)
-        # Extract predictions from the first (and only) result
-        result = results[0]
+        results = self.model(input_images, verbose=False)
+        return [self._parse_result(result) for result in results]
 
+    @staticmethod
+    def _parse_result(result) -> dict:
         # Check if any detections were made
         if len(result.boxes) == 0:
             return {"detected": False, "bbox": None, "confidence": None, "center": None}
@@ -59,6 +65,8 @@ if __name__ == "__main__":
     import cv2
     from tqdm import tqdm
 
+    from sorawm.utils.video_utils import VideoLoader
+
     # ========= 配置 =========
     # video_path = Path("resources/puppies.mp4") # 19700121_1645_68e0a027836c8191a50bea3717ea7485.mp4
     video_path = Path("resources/19700121_1645_68e0a027836c8191a50bea3717ea7485.mp4")
@@ -10,10 +10,11 @@ Usage:
 """
 import sys
 import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
-# Fix Windows console encoding issues
-if sys.platform == "win32":
+# Fix Windows console encoding issues (only when the console is not UTF-8 already)
+if sys.platform == "win32" and (getattr(sys.stdout, "encoding", "") or "").lower() != "utf-8":
     # Try to set UTF-8 mode for Windows console
     try:
         sys.stdout.reconfigure(encoding='utf-8')
@@ -28,14 +29,8 @@ if sys.platform == "win32":
 project_root = Path(__file__).parent
 sys.path.insert(0, str(project_root))
 
-from sorawm.utils.ffmpeg_utils import (
-    find_local_ffmpeg,
-    find_system_ffmpeg,
-    get_ffmpeg_path,
-    verify_ffmpeg_installation,
-    get_ffmpeg_version,
-    configure_ffmpeg_environment,
-)
+# sorawm.utils.ffmpeg_utils is imported inside the functions that use it, so
+# importing this module stays cheap.
 
 
 def print_header(text: str):
@@ -52,11 +47,13 @@ def print_result(success: bool, message: str):
     print(f"[{icon}] {status}: {message}")
 
 
-def test_local_ffmpeg():
+def check_local_ffmpeg(paths=None):
     """Test for local FFmpeg installation."""
+    from sorawm.utils.ffmpeg_utils import find_local_ffmpeg
+
     print_header("Testing Local FFmpeg Installation")
 
-    ffmpeg_path, ffprobe_path = find_local_ffmpeg()
+    ffmpeg_path, ffprobe_path = paths or find_local_ffmpeg()
 
     if ffmpeg_path and ffprobe_path:
         print_result(True, f"Local FFmpeg found at: {ffmpeg_path}")
@@ -67,11 +64,13 @@ def test_local_ffmpeg():
         return False
 
 
-def test_system_ffmpeg():
+def check_system_ffmpeg(paths=None):
     """Test for system FFmpeg installation."""
+    from sorawm.utils.ffmpeg_utils import find_system_ffmpeg
+
     print_header("Testing System FFmpeg Installation")
 
-    ffmpeg_path, ffprobe_path = find_system_ffmpeg()
+    ffmpeg_path, ffprobe_path = paths or find_system_ffmpeg()
 
     if ffmpeg_path and ffprobe_path:
         print_result(True, f"System FFmpeg found at: {ffmpeg_path}")
@@ -82,8 +81,10 @@ def test_system_ffmpeg():
         return False
 
 
-def test_ffmpeg_configuration():
+def check_ffmpeg_configuration():
     """Test FFmpeg configuration."""
+    from sorawm.utils.ffmpeg_utils import configure_ffmpeg_environment
+
     print_header("Testing FFmpeg Configuration")
 
     try:
@@ -95,8 +96,11 @@ def test_ffmpeg_configuration():
         return False
 
 
-def test_ffmpeg_verification():
+def check_ffmpeg_verification():
     """Test FFmpeg verification."""
+    from sorawm.utils.ffmpeg_utils import (get_ffmpeg_version,
+                                           verify_ffmpeg_installation)
+
     print_header("Testing FFmpeg Verification")
 
     if verify_ffmpeg_installation():
@@ -114,20 +118,31 @@ def test_ffmpeg_verification():
 
 def main():
     """Run all FFmpeg tests."""
+    from sorawm.utils.ffmpeg_utils import find_local_ffmpeg, find_system_ffmpeg
+
     print("\n" + "="*60)
     print("  SoraWatermarkCleaner - FFmpeg Setup Test")
     print("="*60)
 
     # Track test results
-    results = []
+    results: dict[str, bool] = {}
+
+    # The local directory scan and the PATH lookup are independent, so run
+    # them concurrently and only print once both are done to keep the output
+    # ordered. Configuration and verification depend on them and stay serial.
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        local_future = executor.submit(find_local_ffmpeg)
+        system_future = executor.submit(find_system_ffmpeg)
+        local_paths = local_future.result()
+        system_paths = system_future.result()
 
     # Test 1: Check local FFmpeg
-    has_local = test_local_ffmpeg()
-    results.append(("Local FFmpeg", has_local))
+    has_local = check_local_ffmpeg(local_paths)
+    results["Local FFmpeg"] = has_local
 
     # Test 2: Check system FFmpeg
-    has_system = test_system_ffmpeg()
-    results.append(("System FFmpeg", has_system))
+    has_system = check_system_ffmpeg(system_paths)
+    results["System FFmpeg"] = has_system
 
     # If neither is available, exit early
     if not has_local and not has_system:
@@ -140,17 +155,17 @@ def main():
         return False
 
     # Test 3: Configuration
-    config_success = test_ffmpeg_configuration()
-    results.append(("FFmpeg Configuration", config_success))
+    config_success = check_ffmpeg_configuration()
+    results["FFmpeg Configuration"] = config_success
 
     # Test 4: Verification
-    verify_success = test_ffmpeg_verification()
-    results.append(("FFmpeg Verification", verify_success))
+    verify_success = check_ffmpeg_verification()
+    results["FFmpeg Verification"] = verify_success
 
     # Print summary
     print_header("Test Summary")
 
-    all_passed = all(result for _, result in results if _ not in ["Local FFmpeg", "System FFmpeg"])
+    all_passed = results["FFmpeg Configuration"] and results["FFmpeg Verification"]
     has_ffmpeg = has_local or has_system
 
     if all_passed and has_ffmpeg:
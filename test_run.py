@@ -1,17 +1,24 @@
+import sys
 from pathlib import Path
-from sorawm.core import SoraWM
-from sorawm.schemas import CleanerType
 
 if __name__ == "__main__":
-    input_video_path = Path("resources/dog_vs_sam.mp4")
-    output_video_path = Path("outputs/sora_watermark_removed_lama.mp4")
+    input_image_path = Path("resources/first_frame.png")
+    output_image_path = Path("outputs/sora_watermark_removed_lama.png")
+
+    # Bail out before paying for the torch/model imports below
+    if not input_image_path.is_file():
+        sys.exit(f"Input not found: {input_image_path}")
+    output_image_path.parent.mkdir(parents=True, exist_ok=True)
+
+    from sorawm.core import SoraWM
+    from sorawm.schemas import CleanerType
 
     print("Starting watermark removal with LAMA model...")
-    print(f"Input: {input_video_path}")
-    print(f"Output: {output_video_path}")
+    print(f"Input: {input_image_path}")
+    print(f"Output: {output_image_path}")
 
     # Use LAMA (fast and good quality)
     sora_wm = SoraWM(cleaner_type=CleanerType.LAMA)
-    sora_wm.run(input_video_path, output_video_path)
+    sora_wm.run_image(input_image_path, output_image_path)
 
-    print(f"\nDone! Check the output at: {output_video_path}")
+    print(f"\nDone! Check the output at: {output_image_path}")
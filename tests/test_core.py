@@ -0,0 +1,51 @@
+import cv2
+import numpy as np
+import pytest
+
+pytest.importorskip("torch")
+pytest.importorskip("ultralytics")
+
+from sorawm.core import SoraWM  # noqa: E402
+
+
+class NoWatermarkDetector:
+    def detect_batch(self, images):
+        return [
+            {"detected": False, "bbox": None, "confidence": None, "center": None}
+            for _ in images
+        ]
+
+
+def make_sora_wm():
+    # Skip __init__ so no model weights are loaded
+    sora_wm = SoraWM.__new__(SoraWM)
+    sora_wm.detector = NoWatermarkDetector()
+    return sora_wm
+
+
+def test_run_images_copies_unchanged_images_through(tmp_path):
+    input_dir = tmp_path / "input"
+    input_dir.mkdir()
+    input_paths = []
+    for i in range(6):
+        image = np.full((32, 48, 3), i * 40, dtype=np.uint8)
+        path = input_dir / f"{i}.png"
+        # Not cv2's default compression, so a re-encode would change the bytes
+        cv2.imwrite(str(path), image, [cv2.IMWRITE_PNG_COMPRESSION, 0])
+        input_paths.append(path)
+
+    progress = []
+    output_paths = make_sora_wm().run_images(
+        input_paths, tmp_path / "output", progress.append, quiet=True
+    )
+
+    assert [p.name for p in output_paths] == [p.name for p in input_paths]
+    for input_path, output_path in zip(input_paths, output_paths):
+        assert output_path.read_bytes() == input_path.read_bytes()
+    assert progress[-1] == 100
+
+
+def test_run_images_rejects_duplicate_names(tmp_path):
+    input_paths = [tmp_path / "a" / "x.png", tmp_path / "b" / "x.png"]
+    with pytest.raises(ValueError, match="x.png"):
+        make_sora_wm().run_images(input_paths, tmp_path / "output")
@@ -0,0 +1,57 @@
+import cv2
+import numpy as np
+import pytest
+
+from sorawm.utils.mask_utils import (DILATE_KERNEL_SIZE, DILATE_SPANS,
+                                     fill_dilated_boxes, kernel_row_spans,
+                                     normalize_bboxes)
+
+
+def test_normalize_bboxes_clips_to_image():
+    boxes = normalize_bboxes((-5, -7, 120, 90), width=100, height=80)
+    np.testing.assert_array_equal(boxes, [[0, 0, 100, 80]])
+
+
+def test_normalize_bboxes_accepts_a_list():
+    boxes = normalize_bboxes([(10, 20, 30, 40), (0, 0, 5, 5)], width=100, height=80)
+    assert boxes.shape == (2, 4)
+    assert boxes.dtype == np.int64
+
+
+def test_normalize_bboxes_removes_duplicates():
+    # The second box only equals the first once clamped
+    boxes = normalize_bboxes(
+        [(10, 20, 30, 40), (10, 20, 30, 40), (-3, 0, 8, 9), (0, 0, 8, 9)],
+        width=100,
+        height=80,
+    )
+    np.testing.assert_array_equal(boxes, [[0, 0, 8, 9], [10, 20, 30, 40]])
+
+
+def test_kernel_row_spans_of_a_rectangle():
+    kernel = np.ones((3, 3), dtype=np.uint8)
+    assert kernel_row_spans(kernel) == [(-1, 1, 1), (0, 1, 1), (1, 1, 1)]
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_fill_dilated_boxes_matches_cv2_dilate(seed):
+    rng = np.random.default_rng(seed)
+    height, width = rng.integers(1, 120, size=2)
+    # Boxes may touch, overlap, be empty or stick out of the image
+    corners = rng.integers(-30, max(height, width) + 30, size=(rng.integers(1, 5), 4))
+    boxes = normalize_bboxes(corners, width, height)
+    boxes = boxes[(boxes[:, 0] < boxes[:, 2]) & (boxes[:, 1] < boxes[:, 3])]
+
+    mask = np.zeros((height, width), dtype=np.uint8)
+    fill_dilated_boxes(mask, boxes, DILATE_SPANS)
+
+    expected = np.zeros((height, width), dtype=np.uint8)
+    for x1, y1, x2, y2 in boxes:
+        expected[y1:y2, x1:x2] = 255
+    expected = cv2.dilate(
+        expected,
+        cv2.getStructuringElement(
+            cv2.MORPH_ELLIPSE, (DILATE_KERNEL_SIZE, DILATE_KERNEL_SIZE)
+        ),
+    )
+    np.testing.assert_array_equal(mask, expected)